@@ -0,0 +1,110 @@
+"""
+Mede o custo de CPU por requisição de depósito e saque e quanto dele é
+economizado pelas consultas pré-construídas de src.api.queries.
+
+Uso:
+    python -m benchmarks.hot_queries [--iterations 500] [--history 500]
+
+Duas medições, em um SQLite em memória:
+- consultas: construção do select() e cálculo da chave de cache a cada
+  chamada (como antes) contra os objetos pré-construídos, sem executar nada;
+- requisição: os handlers reais deposit/withdraw, cada um em uma sessão nova
+  e em uma conta com --history operações. O tempo inclui a thread do aiosqlite.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from sqlalchemy import insert, select, func
+from src.api.endpoints.operations import deposit, withdraw
+from src.api.queries import ACCOUNT_BY_ID, WITHDRAWN_SINCE
+from src.api.schemas import OperationCreate
+from src.db import engine, SessionLocal
+from src.models import Base, BankAccount, Operation, OperationType
+
+def deposit_queries_inline(account_id, since):
+    select(BankAccount).where(BankAccount.id == account_id)._generate_cache_key()
+
+
+def withdraw_queries_inline(account_id, since):
+    select(BankAccount).where(BankAccount.id == account_id)._generate_cache_key()
+    select(func.sum(Operation.amount)).where(
+        Operation.account_id == account_id,
+        Operation.operation_type == OperationType.WITHDRAWAL.value,
+        Operation.timestamp >= since
+    )._generate_cache_key()
+
+
+def deposit_queries_cached(account_id, since):
+    ACCOUNT_BY_ID._generate_cache_key()
+
+
+def withdraw_queries_cached(account_id, since):
+    ACCOUNT_BY_ID._generate_cache_key()
+    WITHDRAWN_SINCE._generate_cache_key()
+
+
+def measure_queries(queries, iterations: int) -> float:
+    since = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    for _ in range(200):
+        queries(1, since)
+    start = time.process_time()
+    for _ in range(iterations * 10):
+        queries(1, since)
+    return (time.process_time() - start) / (iterations * 10) * 1_000_000
+
+
+async def measure_handler(handler, operation_type: str, account_ids: list[int]) -> float:
+    start = time.process_time()
+    for account_id in account_ids:
+        operation = OperationCreate(account_id=account_id, operation_type=operation_type, amount=0.01)
+        async with SessionLocal() as db:
+            await handler(operation, db)
+    return (time.process_time() - start) / len(account_ids) * 1_000_000
+
+
+async def seed(accounts: int, history: int) -> list[int]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        account_ids = (await conn.execute(
+            insert(BankAccount).returning(BankAccount.id),
+            [{"user_id": i, "balance": 1000, "account_type": "checking", "daily_limit": 1000} for i in range(accounts)]
+        )).scalars().all()
+        await conn.execute(insert(Operation), [
+            {"account_id": account_id, "operation_type": "deposit", "amount": 1, "balance_after": 1000}
+            for account_id in account_ids
+            for _ in range(history)
+        ])
+    return list(account_ids)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--history", type=int, default=500, help="Operações por conta")
+    args = parser.parse_args()
+
+    account_ids = await seed(args.iterations * 2, args.history)
+    handlers = (
+        ("deposit", deposit, "deposit", deposit_queries_inline, deposit_queries_cached, account_ids[:args.iterations]),
+        ("withdraw", withdraw, "withdrawal", withdraw_queries_inline, withdraw_queries_cached, account_ids[args.iterations:]),
+    )
+    for name, handler, operation_type, inline, cached, accounts in handlers:
+        before = measure_queries(inline, args.iterations)
+        after = measure_queries(cached, args.iterations)
+        request = await measure_handler(handler, operation_type, accounts)
+        print(
+            f"{name:8} consultas: inline {before:5.1f} µs, pré-construídas {after:5.1f} µs | "
+            f"requisição {request:7.1f} µs | economia {before - after:5.1f} µs "
+            f"({(before - after) / request:.1%} da requisição)"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+Mede a vazão da apuração de juros.
+
+Uso:
+    DATABASE_URL=... python -m benchmarks.interest_accrual [--accounts 1000000] [--chunk-size 5000]
+
+Atenção: cria as tabelas e insere contas no banco apontado por DATABASE_URL.
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+from sqlalchemy import insert
+from src.db import engine, SessionLocal
+from src.jobs.interest import accrue_interest
+from src.models import Base, BankAccount
+
+
+async def seed(accounts: int, batch: int = 50_000) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    for start in range(0, accounts, batch):
+        async with engine.begin() as conn:
+            await conn.execute(insert(BankAccount), [
+                {
+                    "user_id": i,
+                    "balance": 1000 + i % 997,
+                    "account_type": "savings" if i % 10 else "checking",
+                    "daily_limit": 1000,
+                    "is_active": True
+                }
+                for i in range(start, min(start + batch, accounts))
+            ])
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    await seed(args.accounts)
+    print(f"seed: {args.accounts} contas em {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    async with SessionLocal() as db:
+        run = await accrue_interest(db, date.today(), rate=0.005, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(
+        f"apuração: {run.accounts_processed} contas poupança em {elapsed:.1f}s "
+        f"({run.accounts_processed / elapsed:,.0f} contas/s, lote de {args.chunk_size})"
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
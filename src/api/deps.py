@@ -1,17 +1,22 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from src.core.config import settings
+from src.core.profiling import timed
+from src.core.security import decode_subject, decode_token, is_admin
 
 bearer = HTTPBearer()
 
-def validate_token(creds: HTTPAuthorizationCredentials = Depends(bearer)) -> str:
-    token = creds.credentials
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
-        sub = payload.get("sub")
-        if not sub:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return sub
-    except JWTError:
+async def validate_token(creds: HTTPAuthorizationCredentials = Depends(bearer)) -> str:
+    with timed("jwt_ms"):
+        sub = decode_subject(creds.credentials)
+    if not sub:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return sub
+
+async def validate_admin_token(creds: HTTPAuthorizationCredentials = Depends(bearer)) -> str:
+    with timed("jwt_ms"):
+        claims = decode_token(creds.credentials)
+    if not claims or not claims.get("sub"):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if not is_admin(claims):
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    return claims["sub"]
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from datetime import date, datetime
+from src.core.profiling import ProfiledRoute
 from src.db import get_db
-from src.models import BankAccount
-from src.api.schemas import BankAccountCreate, BankAccountOut
+from src.jobs.rollups import rollup_watermark
+from src.models import AccountActivityRollup, BankAccount
+from src.api.schemas import AccountSummaryOut, BankAccountCreate, BankAccountOut
 from src.api.deps import validate_token
+from src.api.queries import ACCOUNT_BY_ID, ACCOUNT_EXISTS
+from src.api.etag import CACHE_CONTROL, account_etag, etag_matches
+from src.api.summary import build_periods, period_filter
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/", response_model=BankAccountOut, status_code=status.HTTP_201_CREATED, dependencies=[Depends(validate_token)])
@@ -82,14 +88,21 @@ async def list_bank_accounts(
 @router.get("/{account_id}", response_model=BankAccountOut, dependencies=[Depends(validate_token)])
 async def get_bank_account(
     account_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Busca uma conta bancária específica por ID.
+
+    Suporta requisições condicionais: com `If-None-Match` igual ao ETag atual
+    a resposta é `304 Not Modified`, sem corpo.
     """
-    result = await db.execute(
-        select(BankAccount).where(BankAccount.id == account_id)
-    )
+    etag = await account_etag(db, account_id, "account")
+    if etag and etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    result = await db.execute(ACCOUNT_BY_ID, {"account_id": account_id})
     account = result.scalar_one_or_none()
     
     if not account:
@@ -98,9 +111,52 @@ async def get_bank_account(
             detail="Conta bancária não encontrada"
         )
     
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return account
 
 
+@router.get("/{account_id}/summary", response_model=AccountSummaryOut, dependencies=[Depends(validate_token)])
+async def get_account_summary(
+    account_id: int,
+    day: date | None = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna a quantidade e o volume de depósitos e saques da conta no dia, no
+    mês do dia e em todo o histórico, lidos dos agregados pré-calculados.
+
+    - **account_id**: ID da conta
+    - **day**: Dia de referência (padrão: hoje, UTC)
+    """
+    result = await db.execute(ACCOUNT_EXISTS, {"account_id": account_id})
+    if not result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conta bancária não encontrada"
+        )
+    
+    day = day or datetime.utcnow().date()
+    result = await db.execute(
+        select(
+            AccountActivityRollup.period,
+            AccountActivityRollup.period_start,
+            AccountActivityRollup.operation_type,
+            AccountActivityRollup.count,
+            AccountActivityRollup.total
+        ).where(
+            AccountActivityRollup.account_id == account_id,
+            period_filter(AccountActivityRollup, day)
+        )
+    )
+    
+    return AccountSummaryOut(
+        account_id=account_id,
+        **build_periods(result.all(), day),
+        refreshed_through_operation_id=await rollup_watermark(db)
+    )
+
+
 @router.patch("/{account_id}/deactivate", dependencies=[Depends(validate_token)])
 async def deactivate_account(
     account_id: int,
@@ -109,9 +165,7 @@ async def deactivate_account(
     """
     Desativa uma conta bancária (soft delete).
     """
-    result = await db.execute(
-        select(BankAccount).where(BankAccount.id == account_id)
-    )
+    result = await db.execute(ACCOUNT_BY_ID, {"account_id": account_id})
     account = result.scalar_one_or_none()
     
     if not account:
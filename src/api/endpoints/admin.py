@@ -0,0 +1,80 @@
+from datetime import date
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core import profiling
+from src.core.config import settings
+from src.core.profiling import ProfiledRoute
+from src.db import engine, db_stats, get_db
+from src.jobs.interest import start_accrual, run_interest_accrual
+from src.jobs.rollups import rollup_watermark, run_rollup_refresh
+from src.models import InterestAccrual
+from src.api.schemas import RequestProfileOut, InterestAccrualOut
+from src.api.deps import validate_admin_token
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/profiles", response_model=list[RequestProfileOut], dependencies=[Depends(validate_admin_token)])
+async def list_profiles():
+    """
+    Retorna os perfis de requisição mais recentes, do mais novo ao mais antigo.
+    """
+    return list(reversed(profiling.profiles))
+
+
+@router.get("/db-stats", dependencies=[Depends(validate_admin_token)])
+async def get_db_stats():
+    """
+    Retorna os contadores de consultas canceladas por timeout ou por
+    desconexão do cliente e o estado do pool de conexões.
+    """
+    return {**db_stats, "pool": engine.pool.status()}
+
+
+@router.post("/interest/accrue", response_model=InterestAccrualOut, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(validate_admin_token)])
+async def accrue_interest(
+    background_tasks: BackgroundTasks,
+    accrual_date: date | None = None,
+    rate: float | None = Query(None, gt=0, le=settings.INTEREST_MAX_RATE),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Dispara a apuração de juros das contas poupança em segundo plano.
+
+    - **accrual_date**: Data da apuração (padrão: hoje)
+    - **rate**: Taxa aplicada, maior que 0 e até INTEREST_MAX_RATE (padrão: SAVINGS_INTEREST_RATE; ignorada se a data já foi iniciada)
+    """
+    run = await start_accrual(db, accrual_date or date.today(), rate)
+    if not run.completed:
+        background_tasks.add_task(run_interest_accrual, run.accrual_date)
+    return run
+
+
+@router.get("/interest/{accrual_date}", response_model=InterestAccrualOut, dependencies=[Depends(validate_admin_token)])
+async def get_interest_accrual(
+    accrual_date: date,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna o andamento da apuração de juros de uma data.
+    """
+    run = await db.get(InterestAccrual, accrual_date)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Apuração de juros não encontrada"
+        )
+    return run
+
+
+@router.post("/rollups/refresh", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(validate_admin_token)])
+async def refresh_rollups(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Dispara em segundo plano a atualização dos agregados de movimentação com
+    as operações posteriores à marca d'água.
+    """
+    background_tasks.add_task(run_rollup_refresh)
+    return {"refreshed_through_operation_id": await rollup_watermark(db)}
@@ -1,11 +1,15 @@
 from pydantic import BaseModel
-from fastapi import APIRouter
-from src.core.security import create_access_token
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from src.core.profiling import ProfiledRoute, timed
+from src.core.security import create_access_token, verify_admin_password
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 class LoginIn(BaseModel):
     username: str
+    # Exigida apenas para o token de administrador (ADMIN_PASSWORD_HASHES)
+    password: str | None = None
 
 class TokenOut(BaseModel):
     access_token: str
@@ -13,5 +17,10 @@ class TokenOut(BaseModel):
 
 @router.post("/login", response_model=TokenOut)
 async def login(data: LoginIn):
-    token = create_access_token(subject=data.username)
+    admin = data.password is not None
+    # bcrypt é lento de propósito: roda fora do event loop
+    if admin and not await run_in_threadpool(verify_admin_password, data.username, data.password):
+        raise HTTPException(status_code=401, detail="Credenciais de administrador inválidas")
+    with timed("jwt_ms"):
+        token = create_access_token(subject=data.username, admin=admin)
     return TokenOut(access_token=token)
@@ -3,11 +3,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi_pagination import Page, paginate
+from src.core.profiling import ProfiledRoute
 from src.db import get_db
 from src.models import Item
 from src.api.deps import validate_token
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 class ItemCreate(BaseModel):
     name: str
@@ -1,20 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from datetime import datetime, timedelta
+from src.core.profiling import ProfiledRoute
 from src.db import get_db
 from src.models import BankAccount, Operation, OperationType
 from src.api.schemas import OperationCreate, OperationOut, StatementOut
 from src.api.deps import validate_token
+from src.api.queries import ACCOUNT_BY_ID, WITHDRAWN_SINCE, STATEMENT_PAGE, STATEMENT_COUNT
+from src.api.etag import CACHE_CONTROL, account_etag, etag_matches
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 async def validate_and_get_account(account_id: int, db: AsyncSession) -> BankAccount:
     """Valida e retorna uma conta bancária ativa"""
-    result = await db.execute(
-        select(BankAccount).where(BankAccount.id == account_id)
-    )
+    result = await db.execute(ACCOUNT_BY_ID, {"account_id": account_id})
     account = result.scalar_one_or_none()
     
     if not account:
@@ -37,13 +38,7 @@ async def check_daily_withdrawal_limit(account: BankAccount, amount: float, db:
     today = datetime.utcnow().date()
     today_start = datetime.combine(today, datetime.min.time())
     
-    result = await db.execute(
-        select(func.sum(Operation.amount)).where(
-            Operation.account_id == account.id,
-            Operation.operation_type == OperationType.WITHDRAWAL.value,
-            Operation.timestamp >= today_start
-        )
-    )
+    result = await db.execute(WITHDRAWN_SINCE, {"account_id": account.id, "since": today_start})
     total_withdrawn_today = result.scalar() or 0.0
     
     if float(total_withdrawn_today) + amount > float(account.daily_limit):
@@ -146,6 +141,8 @@ async def withdraw(
 @router.get("/{account_id}/statement", response_model=StatementOut, dependencies=[Depends(validate_token)])
 async def get_statement(
     account_id: int,
+    request: Request,
+    response: Response,
     limit: int = 50,
     offset: int = 0,
     db: AsyncSession = Depends(get_db)
@@ -156,23 +153,24 @@ async def get_statement(
     - **account_id**: ID da conta
     - **limit**: Número de operações por página
     - **offset**: Offset para paginação
+
+    Suporta requisições condicionais: com `If-None-Match` igual ao ETag atual
+    a resposta é `304 Not Modified`, sem consultar a página nem a contagem.
     """
+    etag = await account_etag(db, account_id, "statement", limit, offset, require_active=True)
+    if etag and etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
     account = await validate_and_get_account(account_id, db)
     
-    result = await db.execute(
-        select(Operation)
-        .where(Operation.account_id == account_id)
-        .order_by(Operation.timestamp.desc())
-        .offset(offset)
-        .limit(limit)
-    )
+    result = await db.execute(STATEMENT_PAGE, {"account_id": account_id, "offset": offset, "limit": limit})
     operations = result.scalars().all()
     
-    count_result = await db.execute(
-        select(func.count(Operation.id)).where(Operation.account_id == account_id)
-    )
+    count_result = await db.execute(STATEMENT_COUNT, {"account_id": account_id})
     total_operations = count_result.scalar()
     
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return StatementOut(
         account=account,
         operations=operations,
@@ -192,7 +190,7 @@ async def list_operations(
     Lista operações com filtros opcionais.
     
     - **account_id**: Filtrar por conta específica
-    - **operation_type**: Filtrar por tipo de operação (deposit/withdrawal)
+    - **operation_type**: Filtrar por tipo de operação (deposit/withdrawal/interest)
     - **skip**: Offset para paginação
     - **limit**: Número máximo de resultados
     """
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import date, datetime
+from src.core.profiling import ProfiledRoute
+from src.db import get_db
+from src.jobs.rollups import rollup_watermark
+from src.models import AccountType, UserActivityRollup
+from src.api.schemas import AccountTypeSummaryOut, UserSummaryOut
+from src.api.deps import validate_token
+from src.api.summary import build_periods, period_filter
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/{user_id}/summary", response_model=UserSummaryOut, dependencies=[Depends(validate_token)])
+async def get_user_summary(
+    user_id: int,
+    day: date | None = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna, por tipo de conta, a quantidade e o volume de depósitos e saques
+    do usuário no dia, no mês do dia e em todo o histórico, lidos dos
+    agregados pré-calculados.
+
+    - **user_id**: ID do usuário
+    - **day**: Dia de referência (padrão: hoje, UTC)
+    """
+    day = day or datetime.utcnow().date()
+    result = await db.execute(
+        select(
+            UserActivityRollup.account_type,
+            UserActivityRollup.period,
+            UserActivityRollup.period_start,
+            UserActivityRollup.operation_type,
+            UserActivityRollup.count,
+            UserActivityRollup.total
+        ).where(
+            UserActivityRollup.user_id == user_id,
+            period_filter(UserActivityRollup, day)
+        )
+    )
+    rows = result.all()
+    
+    return UserSummaryOut(
+        user_id=user_id,
+        account_types=[
+            AccountTypeSummaryOut(
+                account_type=account_type.value,
+                **build_periods([row[1:] for row in rows if row[0] == account_type], day)
+            )
+            for account_type in AccountType
+        ],
+        refreshed_through_operation_id=await rollup_watermark(db)
+    )
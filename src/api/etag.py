@@ -0,0 +1,35 @@
+import hashlib
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.api.queries import ACCOUNT_ETAG_STATE
+
+CACHE_CONTROL = "private, no-cache"
+
+
+async def account_etag(db: AsyncSession, account_id: int, *variant, require_active: bool = False) -> str | None:
+    """
+    Gera o ETag de uma leitura da conta a partir do estado da conta e do id da
+    sua última operação, com uma única consulta indexada. Depósitos, saques e a
+    desativação alteram esse estado e, portanto, o ETag.
+
+    `variant` diferencia representações da mesma conta (ex.: página do extrato).
+    Com `require_active`, contas desativadas não têm ETag, para que a rota
+    responda o erro normal em vez de 304.
+    """
+    row = (await db.execute(ACCOUNT_ETAG_STATE, {"account_id": account_id})).first()
+    if row is None or (require_active and not row.is_active):
+        return None
+
+    state = repr((account_id, *row, *variant)).encode()
+    return f'W/"{hashlib.blake2b(state, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Compara o If-None-Match da requisição com o ETag (comparação fraca)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in header.split(","))
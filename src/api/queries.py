@@ -0,0 +1,45 @@
+"""
+Consultas do caminho quente, construídas uma única vez com parâmetros nomeados.
+
+Reutilizar o mesmo objeto evita reconstruir o select() a cada requisição; a
+chave de cache do SQLAlchemy fica memorizada no objeto e o SQL compilado vem
+do cache do engine (query_cache_size), restando apenas vincular os valores.
+No asyncpg o SQL resultante é sempre o mesmo, o que também aproveita o cache
+de prepared statements por conexão (DB_PREPARED_STATEMENT_CACHE_SIZE).
+"""
+from sqlalchemy import Integer, bindparam, func, select
+from sqlalchemy.orm import raiseload
+from src.models import BankAccount, Operation, OperationType
+
+# Sem o carregamento selectin do histórico de operações: nenhum handler o usa
+ACCOUNT_BY_ID = (
+    select(BankAccount)
+    .where(BankAccount.id == bindparam("account_id"))
+    .options(raiseload(BankAccount.operations))
+)
+
+# Só o id, para checar a existência da conta
+ACCOUNT_EXISTS = select(BankAccount.id).where(BankAccount.id == bindparam("account_id"))
+
+WITHDRAWN_SINCE = select(func.sum(Operation.amount)).where(
+    Operation.account_id == bindparam("account_id"),
+    Operation.operation_type == OperationType.WITHDRAWAL.value,
+    Operation.timestamp >= bindparam("since")
+)
+
+STATEMENT_PAGE = (
+    select(Operation)
+    .where(Operation.account_id == bindparam("account_id"))
+    .order_by(Operation.timestamp.desc())
+    .offset(bindparam("offset", type_=Integer))
+    .limit(bindparam("limit", type_=Integer))
+)
+
+STATEMENT_COUNT = select(func.count(Operation.id)).where(Operation.account_id == bindparam("account_id"))
+
+ACCOUNT_ETAG_STATE = select(
+    BankAccount.is_active,
+    BankAccount.balance,
+    BankAccount.daily_limit,
+    select(func.max(Operation.id)).where(Operation.account_id == BankAccount.id).scalar_subquery()
+).where(BankAccount.id == bindparam("account_id"))
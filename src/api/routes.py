@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from src.api.endpoints import auth, items, accounts, operations
+from src.api.endpoints import auth, items, accounts, operations, users, admin
 
 router = APIRouter()
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(items.router, prefix="/items", tags=["items"])
 router.include_router(accounts.router, prefix="/accounts", tags=["bank-accounts"])
 router.include_router(operations.router, prefix="/operations", tags=["bank-operations"])
+router.include_router(users.router, prefix="/users", tags=["users"])
+router.include_router(admin.router, prefix="/admin", tags=["admin"])
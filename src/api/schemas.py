@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -84,3 +84,75 @@ class StatementOut(BaseModel):
     account: BankAccountOut
     operations: list[OperationOut]
     total_operations: int
+
+
+class RequestProfileOut(BaseModel):
+    """Schema de saída de um perfil de requisição"""
+    method: str
+    path: str
+    started_at: datetime
+    trigger: str
+    status_code: int | None
+    total_ms: float
+    sql_ms: float
+    sql_count: int
+    orm_ms: float
+    serialization_ms: float
+    jwt_ms: float
+    call_profile: str
+    call_profile_skipped: bool
+
+    model_config = {"from_attributes": True}
+
+
+class InterestAccrualOut(BaseModel):
+    """Schema de saída de uma apuração de juros"""
+    accrual_date: date
+    rate: float
+    last_account_id: int
+    accounts_processed: int
+    total_interest: float
+    completed: bool
+    started_at: datetime
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+
+class ActivityTotals(BaseModel):
+    """Quantidade e volume de operações"""
+    count: int = 0
+    total: float = 0.0
+
+
+class ActivityPeriodOut(BaseModel):
+    """Movimentação de um período"""
+    period: str
+    period_start: date
+    deposits: ActivityTotals
+    withdrawals: ActivityTotals
+    interest: ActivityTotals
+
+
+class AccountSummaryOut(BaseModel):
+    """Resumo de movimentação de uma conta"""
+    account_id: int
+    day: ActivityPeriodOut
+    month: ActivityPeriodOut
+    all_time: ActivityPeriodOut
+    refreshed_through_operation_id: int
+
+
+class AccountTypeSummaryOut(BaseModel):
+    """Resumo de movimentação de um usuário em um tipo de conta"""
+    account_type: AccountType
+    day: ActivityPeriodOut
+    month: ActivityPeriodOut
+    all_time: ActivityPeriodOut
+
+
+class UserSummaryOut(BaseModel):
+    """Resumo de movimentação de um usuário por tipo de conta"""
+    user_id: int
+    account_types: list[AccountTypeSummaryOut]
+    refreshed_through_operation_id: int
@@ -0,0 +1,41 @@
+from datetime import date
+from sqlalchemy import and_, or_
+from src.models import ALL_TIME_START, OperationType, RollupPeriod
+from src.api.schemas import ActivityPeriodOut, ActivityTotals
+
+
+def period_filter(model, day: date):
+    """Filtra os agregados do dia, do mês do dia e de todo o histórico"""
+    return or_(*(
+        and_(model.period == period, model.period_start == period_start)
+        for period, period_start in _periods(day)
+    ))
+
+
+def build_periods(rows, day: date) -> dict[str, ActivityPeriodOut]:
+    """
+    Monta a movimentação por período a partir das linhas
+    (period, period_start, operation_type, count, total) dos agregados.
+    """
+    totals = {
+        (period, operation_type): ActivityTotals(count=count, total=float(total))
+        for period, _, operation_type, count, total in rows
+    }
+    return {
+        name: ActivityPeriodOut(
+            period=period,
+            period_start=period_start,
+            deposits=totals.get((period, OperationType.DEPOSIT), ActivityTotals()),
+            withdrawals=totals.get((period, OperationType.WITHDRAWAL), ActivityTotals()),
+            interest=totals.get((period, OperationType.INTEREST), ActivityTotals())
+        )
+        for name, (period, period_start) in zip(("day", "month", "all_time"), _periods(day))
+    }
+
+
+def _periods(day: date) -> list[tuple[str, date]]:
+    return [
+        (RollupPeriod.DAY.value, day),
+        (RollupPeriod.MONTH.value, day.replace(day=1)),
+        (RollupPeriod.ALL.value, ALL_TIME_START),
+    ]
@@ -0,0 +1,56 @@
+import asyncio
+from src.db import db_stats
+
+_CANCELLABLE_METHODS = {"GET", "HEAD"}
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    Middleware ASGI que cancela leituras cujo cliente desconectou.
+
+    Enquanto uma requisição GET/HEAD ainda não começou a responder, a mensagem
+    `http.disconnect` do servidor cancela a task da requisição: a consulta em
+    andamento é interrompida (o asyncpg envia o cancelamento ao PostgreSQL) e
+    a sessão é fechada, devolvendo a conexão ao pool.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in _CANCELLABLE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        messages = asyncio.Queue()
+        response_started = False
+        disconnected = False
+
+        async def listen_for_disconnect():
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    if not response_started:
+                        disconnected = True
+                        db_stats["cancelled_on_disconnect"] += 1
+                        task.cancel()
+                    return
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        listener = asyncio.create_task(listen_for_disconnect())
+        try:
+            await self.app(scope, messages.get, send_wrapper)
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+            task.uncancel()
+        finally:
+            listener.cancel()
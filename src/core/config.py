@@ -6,6 +6,44 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALG: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Administradores: usuário → hash bcrypt da senha exigida no login
+    ADMIN_PASSWORD_HASHES: dict[str, str] = {}
+
+    # Cache de SQL compilado do SQLAlchemy (por engine) e de prepared
+    # statements do asyncpg (por conexão)
+    DB_QUERY_CACHE_SIZE: int = 500
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_BUFFER_SIZE: int = 100
+    PROFILING_HEADER: str = "X-Profile-Token"
+
+    SAVINGS_INTEREST_RATE: float = 0.005
+    # Teto da taxa aceita por apuração: cada data é aplicada uma única vez
+    INTEREST_MAX_RATE: float = 0.05
+    INTEREST_CHUNK_SIZE: int = 5000
+
+    LEDGER_ACCOUNT_CHUNK_SIZE: int = 1000
+    LEDGER_STREAM_BATCH_SIZE: int = 10000
+    # Operações mais recentes que isso esperam a próxima verificação
+    LEDGER_SAFETY_LAG_SECONDS: int = 60
+
+    ROLLUP_BATCH_SIZE: int = 50000
+    # Operações mais recentes que isso esperam a próxima atualização dos agregados
+    ROLLUP_SAFETY_LAG_SECONDS: int = 5
+    # Ids pulados pela marca d'água são procurados por esse tempo antes de descartados
+    ROLLUP_GAP_TIMEOUT_SECONDS: int = 600
+    # Máximo de ids pulados acompanhados ao mesmo tempo
+    ROLLUP_MAX_GAPS: int = 1000
+
+    # Timeout das consultas (PostgreSQL) por requisição, em ms; 0 desativa.
+    # ROUTE_STATEMENT_TIMEOUTS_MS sobrescreve o padrão pelo nome do endpoint.
+    STATEMENT_TIMEOUT_MS: int = 5000
+    ROUTE_STATEMENT_TIMEOUTS_MS: dict[str, int] = {
+        "list_operations": 2000,
+        "list_bank_accounts": 2000,
+        "get_statement": 2000,
+    }
 
     model_config = SettingsConfigDict(env_file=".env")
 
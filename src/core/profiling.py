@@ -0,0 +1,227 @@
+import cProfile
+import io
+import pstats
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src.core.config import settings
+from src.core.security import decode_token, is_admin
+
+
+@dataclass
+class RequestProfile:
+    """Resultado do profiling de uma requisição"""
+    method: str
+    path: str
+    started_at: datetime
+    trigger: str
+    status_code: int | None = None
+    total_ms: float = 0.0
+    sql_ms: float = 0.0
+    sql_count: int = 0
+    orm_ms: float = 0.0
+    serialization_ms: float = 0.0
+    jwt_ms: float = 0.0
+    call_profile: str = ""
+    call_profile_skipped: bool = False
+
+
+# Buffer circular com os perfis mais recentes (lido pelo endpoint de admin)
+profiles: deque[RequestProfile] = deque(maxlen=settings.PROFILING_BUFFER_SIZE)
+
+_current_profile: ContextVar[RequestProfile | None] = ContextVar("current_profile", default=None)
+# Instante em que o endpoint retornou (início da serialização da resposta)
+_endpoint_returned: ContextVar[float | None] = ContextVar("endpoint_returned", default=None)
+_in_orm: ContextVar[bool] = ContextVar("in_orm", default=False)
+# cProfile é global ao interpretador: apenas uma requisição tem call profile por vez
+_profiler_busy = False
+
+# Frames do event loop, que o cProfile atribui à requisição perfilada
+_EVENT_LOOP_FRAMES = r"^(?!.*(asyncio/|selectors\.py|select\.epoll|uvloop))"
+
+
+@contextmanager
+def timed(category: str):
+    """Soma o tempo do bloco à categoria (ex.: "jwt_ms") do perfil da requisição atual"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(profile, category, getattr(profile, category) + (time.perf_counter() - start) * 1000)
+
+
+@contextmanager
+def _orm_timer():
+    # Tempo das chamadas da Session, descontado o SQL medido nos eventos do cursor
+    profile = _current_profile.get()
+    if profile is None or _in_orm.get():
+        yield
+        return
+    token = _in_orm.set(True)
+    start, sql_start = time.perf_counter(), profile.sql_ms
+    try:
+        yield
+    finally:
+        _in_orm.reset(token)
+        profile.orm_ms += (time.perf_counter() - start) * 1000 - (profile.sql_ms - sql_start)
+
+
+class ProfiledSession(Session):
+    """Session que mede o tempo de ORM das requisições perfiladas"""
+
+    def execute(self, *args, **kwargs):
+        with _orm_timer():
+            return super().execute(*args, **kwargs)
+
+    def flush(self, objects=None):
+        with _orm_timer():
+            return super().flush(objects)
+
+
+def _mark_endpoint_return(endpoint):
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        _endpoint_returned.set(time.perf_counter())
+        return result
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Rota que mede a serialização das requisições perfiladas: o tempo entre o
+    retorno do endpoint e a resposta pronta (response_model e JSON).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_endpoint_return(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request):
+            response = await handler(request)
+            profile, returned = _current_profile.get(), _endpoint_returned.get()
+            if profile is not None and returned is not None:
+                profile.serialization_ms += (time.perf_counter() - returned) * 1000
+            return response
+
+        return profiled_handler
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profiling_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("profiling_query_start")
+    if starts:
+        profile.sql_ms += (time.perf_counter() - starts.pop()) * 1000
+        profile.sql_count += 1
+
+
+def install_sql_timing(engine: Engine) -> None:
+    """Registra os eventos que medem o tempo de SQL das requisições perfiladas"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _profiling_trigger(scope) -> str | None:
+    header = settings.PROFILING_HEADER.lower().encode()
+    for name, value in scope["headers"]:
+        if name == header:
+            if is_admin(decode_token(value.decode("latin-1"))):
+                return "header"
+            break
+    if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+def _summarize(profile: RequestProfile, profiler: cProfile.Profile) -> None:
+    # O cProfile vê todo o event loop, inclusive outras requisições em andamento:
+    # serve de pista, e a quebra de tempo vem dos medidores da própria requisição
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats("tottime").print_stats(_EVENT_LOOP_FRAMES, 25)
+    profile.call_profile = output.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI de profiling opcional.
+
+    Uma requisição é perfilada quando traz o header configurado em
+    PROFILING_HEADER com um token JWT de administrador, ou quando é sorteada
+    pela taxa PROFILING_SAMPLE_RATE. As demais seguem direto para a aplicação.
+
+    SQL, ORM, serialização e JWT são medidos por requisição. O call profile
+    (cProfile) é um extra que roda em uma requisição por vez; nas demais
+    perfiladas ao mesmo tempo ele fica vazio e call_profile_skipped é marcado.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _profiler_busy
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = _profiling_trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            method=scope["method"],
+            path=scope["path"],
+            started_at=datetime.utcnow(),
+            trigger=trigger
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+            await send(message)
+
+        profiler = None
+        if _profiler_busy:
+            profile.call_profile_skipped = True
+        else:
+            _profiler_busy = True
+            profiler = cProfile.Profile()
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _profiler_busy = False
+            profile.total_ms = (time.perf_counter() - start) * 1000
+            _current_profile.reset(token)
+            if profiler is not None:
+                _summarize(profile, profiler)
+            profiles.append(profile)
@@ -1,8 +1,29 @@
+import bcrypt
 from datetime import datetime, timedelta, timezone
-from jose import jwt
+from jose import jwt, JWTError
 from src.core.config import settings
 
-def create_access_token(subject: str) -> str:
+def create_access_token(subject: str, admin: bool = False) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {"sub": subject, "exp": expire}
+    if admin:
+        payload["admin"] = True
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG)
+
+def decode_token(token: str) -> dict | None:
+    try:
+        return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+    except JWTError:
+        return None
+
+def decode_subject(token: str) -> str | None:
+    claims = decode_token(token)
+    return (claims or {}).get("sub") or None
+
+def verify_admin_password(username: str, password: str) -> bool:
+    hashed = settings.ADMIN_PASSWORD_HASHES.get(username)
+    return hashed is not None and bcrypt.checkpw(password.encode(), hashed.encode())
+
+def is_admin(claims: dict | None) -> bool:
+    # Claim assinado no login com senha; o usuário ainda precisa estar configurado
+    return bool(claims) and claims.get("admin") is True and claims.get("sub") in settings.ADMIN_PASSWORD_HASHES
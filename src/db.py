@@ -1,9 +1,98 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import asyncio
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from src.core.config import settings
+from src.core.profiling import ProfiledSession
 
-engine = create_async_engine(settings.DATABASE_URL)
-SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+# Contadores reportados em /admin/db-stats
+db_stats = {"statement_timeouts": 0, "cancelled_on_disconnect": 0}
 
-async def get_db():
-    async with SessionLocal() as session:
+
+def _configure_sqlite(engine: AsyncEngine) -> None:
+    """
+    Ajusta o SQLite embarcado (aiosqlite) para se comportar como o PostgreSQL:
+    chaves estrangeiras ativas e transações controladas pelo SQLAlchemy, o que
+    permite SAVEPOINTs aninhados.
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def asyncpg_connect_args() -> dict:
+    """Argumentos de conexão do asyncpg: cache de prepared statements e timeout padrão"""
+    connect_args = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if settings.STATEMENT_TIMEOUT_MS:
+        # Definido uma vez por conexão, sem comando extra a cada transação
+        connect_args["server_settings"] = {"statement_timeout": str(settings.STATEMENT_TIMEOUT_MS)}
+    return connect_args
+
+
+def build_engine(database_url: str) -> AsyncEngine:
+    """Cria o engine assíncrono para PostgreSQL (asyncpg) ou SQLite (aiosqlite)"""
+    url = make_url(database_url)
+    options = {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
+    if url.get_backend_name() != "sqlite":
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = asyncpg_connect_args()
+        return create_async_engine(url, **options)
+
+    if url.database in (None, "", ":memory:"):
+        # Banco em memória: todas as sessões compartilham a mesma conexão
+        options["poolclass"] = StaticPool
+    engine = create_async_engine(url, **options)
+    _configure_sqlite(engine)
+    return engine
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    # A conexão já usa STATEMENT_TIMEOUT_MS; SET LOCAL (até o fim da transação)
+    # só quando a sessão pede outro valor. Sessões fora de requisições (jobs)
+    # rodam sem timeout.
+    timeout = session.info.get("statement_timeout_ms", 0)
+    if timeout != settings.STATEMENT_TIMEOUT_MS and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+def statement_timeout_for(request: Request) -> int:
+    """Timeout das consultas do endpoint da requisição, em ms"""
+    endpoint = request.scope.get("endpoint")
+    name = getattr(endpoint, "__name__", None)
+    return settings.ROUTE_STATEMENT_TIMEOUTS_MS.get(name, settings.STATEMENT_TIMEOUT_MS)
+
+
+def dialect_insert(db: AsyncSession, model):
+    """INSERT com suporte a ON CONFLICT (PostgreSQL e SQLite)"""
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
+
+
+def is_statement_timeout(exc: Exception) -> bool:
+    """Indica se o erro do banco é um cancelamento por statement_timeout"""
+    return getattr(getattr(exc, "orig", None), "sqlstate", None) == "57014"
+
+
+engine = build_engine(settings.DATABASE_URL)
+SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, sync_session_class=ProfiledSession, expire_on_commit=False)
+
+async def get_db(request: Request):
+    session = SessionLocal()
+    session.info["statement_timeout_ms"] = statement_timeout_for(request)
+    try:
         yield session
+    finally:
+        # Devolve a conexão ao pool mesmo se a requisição foi cancelada
+        await asyncio.shield(session.close())
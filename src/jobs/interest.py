@@ -0,0 +1,156 @@
+"""
+Apuração de juros das contas poupança.
+
+Uso:
+    python -m src.jobs.interest [--date AAAA-MM-DD] [--rate 0.005] [--chunk-size 5000]
+"""
+import argparse
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import select, insert, update, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.db import SessionLocal, dialect_insert
+from src.models import AccountType, BankAccount, InterestAccrual, Operation, OperationType
+
+
+async def start_accrual(db: AsyncSession, accrual_date: date, rate: float | None = None) -> InterestAccrual:
+    """Retorna a execução da data, criando-a se ainda não existir"""
+    rate = settings.SAVINGS_INTEREST_RATE if rate is None else rate
+    if not 0 < rate <= settings.INTEREST_MAX_RATE:
+        raise ValueError(f"A taxa de juros deve ser maior que 0 e no máximo {settings.INTEREST_MAX_RATE}")
+
+    # Requisições simultâneas para a mesma data: a segunda não insere e lê a primeira
+    await db.execute(
+        dialect_insert(db, InterestAccrual)
+        .values(
+            accrual_date=accrual_date,
+            rate=rate,
+            last_account_id=0,
+            accounts_processed=0,
+            total_interest=0.0,
+            completed=False
+        )
+        .on_conflict_do_nothing(index_elements=["accrual_date"])
+    )
+    await db.commit()
+    return await db.get(InterestAccrual, accrual_date, populate_existing=True)
+
+
+async def _accrue_chunk(db: AsyncSession, accrual_date: date, chunk_size: int) -> InterestAccrual:
+    # Bloqueia a execução: execuções concorrentes da mesma data se alternam por lote
+    run = (await db.execute(
+        select(InterestAccrual)
+        .where(InterestAccrual.accrual_date == accrual_date)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+    if run.completed:
+        return run
+
+    rate = Decimal(str(run.rate))
+    interest = func.round(BankAccount.balance * rate, 2)
+
+    chunk_ids = (await db.execute(
+        select(BankAccount.id)
+        .where(
+            BankAccount.account_type == AccountType.SAVINGS.value,
+            BankAccount.is_active == True,
+            BankAccount.id > run.last_account_id
+        )
+        .order_by(BankAccount.id)
+        .limit(chunk_size)
+        .with_for_update()
+    )).scalars().all()
+
+    if not chunk_ids:
+        run.completed = True
+        run.finished_at = datetime.utcnow()
+        await db.commit()
+        return run
+
+    in_chunk = (
+        BankAccount.account_type == AccountType.SAVINGS.value,
+        BankAccount.is_active == True,
+        BankAccount.id > run.last_account_id,
+        BankAccount.id <= chunk_ids[-1],
+        interest > 0
+    )
+
+    # As operações (tipo INTEREST, fora do volume de depósitos) são gravadas antes
+    # da atualização, a partir do saldo anterior, com o horário real da gravação;
+    # a data da apuração fica na descrição
+    amounts = (await db.execute(
+        insert(Operation).from_select(
+            ["account_id", "operation_type", "amount", "balance_after", "description", "timestamp"],
+            select(
+                BankAccount.id,
+                literal(OperationType.INTEREST.value, Operation.__table__.c.operation_type.type),
+                interest,
+                BankAccount.balance + interest,
+                literal(f"Juros {accrual_date.isoformat()}"),
+                literal(datetime.utcnow(), Operation.__table__.c.timestamp.type)
+            ).where(*in_chunk)
+        ).returning(Operation.amount)
+    )).scalars().all()
+    updated = (await db.execute(
+        update(BankAccount)
+        .where(*in_chunk)
+        .values(balance=BankAccount.balance + interest)
+        .returning(BankAccount.id)
+        .execution_options(synchronize_session=False)
+    )).scalars().all()
+
+    run.last_account_id = chunk_ids[-1]
+    run.accounts_processed += len(updated)
+    run.total_interest = Decimal(str(run.total_interest)) + sum(amounts, Decimal("0"))
+    await db.commit()
+    return run
+
+
+async def accrue_interest(
+    db: AsyncSession,
+    accrual_date: date,
+    rate: float | None = None,
+    chunk_size: int | None = None
+) -> InterestAccrual:
+    """
+    Aplica os juros do dia a todas as contas poupança ativas.
+
+    Cada lote de contas é processado em uma transação com um INSERT ... SELECT
+    das operações e um UPDATE ... RETURNING dos saldos, e avança o cursor da
+    execução (last_account_id). Uma execução interrompida continua de onde
+    parou e uma data já concluída não é aplicada novamente.
+    """
+    chunk_size = chunk_size or settings.INTEREST_CHUNK_SIZE
+    run = await start_accrual(db, accrual_date, rate)
+    while not run.completed:
+        run = await _accrue_chunk(db, accrual_date, chunk_size)
+    return run
+
+
+async def run_interest_accrual(accrual_date: date, rate: float | None = None, chunk_size: int | None = None) -> InterestAccrual:
+    async with SessionLocal() as db:
+        return await accrue_interest(db, accrual_date, rate, chunk_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apuração de juros das contas poupança")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="Data da apuração (AAAA-MM-DD)")
+    parser.add_argument("--rate", type=float, default=None, help="Taxa aplicada (padrão: SAVINGS_INTEREST_RATE)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Contas por lote (padrão: INTEREST_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    try:
+        run = asyncio.run(run_interest_accrual(args.date, args.rate, args.chunk_size))
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(
+        f"Apuração {run.accrual_date}: {run.accounts_processed} contas, "
+        f"R$ {run.total_interest} em juros (taxa {run.rate})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Verificação incremental da integridade do livro-razão.
+
+Uso:
+    python -m src.jobs.ledger [--account-chunk-size 1000] [--batch-size 10000] [--interval SEGUNDOS]
+
+Retorna código de saída 1 quando encontra divergências, para uso em cron/alertas.
+"""
+import argparse
+import asyncio
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.db import SessionLocal
+from src.models import BankAccount, LedgerCheckpoint, Operation, OperationType
+
+
+@dataclass
+class LedgerMismatch:
+    """Divergência encontrada na cadeia de saldos de uma conta"""
+    account_id: int
+    operation_id: int | None
+    kind: str
+    expected: Decimal
+    found: Decimal
+
+
+@dataclass
+class LedgerReport:
+    """Resultado de uma verificação"""
+    accounts_checked: int = 0
+    operations_verified: int = 0
+    mismatches: list[LedgerMismatch] = field(default_factory=list)
+
+
+_CREDITS = (OperationType.DEPOSIT, OperationType.INTEREST)
+
+
+def _signed_amount(operation_type: OperationType, amount: Decimal) -> Decimal:
+    return amount if operation_type in _CREDITS else -amount
+
+
+async def _verify_chunk(
+    db: AsyncSession,
+    cursor: int,
+    horizon: int,
+    account_chunk_size: int,
+    batch_size: int,
+    report: LedgerReport
+) -> int | None:
+    if db.bind.dialect.name == "postgresql":
+        # Saldos e operações lidos do mesmo snapshot
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    accounts = (await db.execute(
+        select(BankAccount.id, BankAccount.balance)
+        .where(BankAccount.id > cursor)
+        .order_by(BankAccount.id)
+        .limit(account_chunk_size)
+    )).all()
+    if not accounts:
+        await db.commit()
+        return None
+
+    account_ids = [account_id for account_id, _ in accounts]
+    checkpoints = {
+        row.account_id: row
+        for row in (await db.execute(
+            select(LedgerCheckpoint.account_id, LedgerCheckpoint.last_operation_id, LedgerCheckpoint.last_balance_after)
+            .where(LedgerCheckpoint.account_id.in_(account_ids))
+        )).all()
+    }
+    last_balance = {account_id: cp.last_balance_after for account_id, cp in checkpoints.items()}
+    last_operation = {}
+
+    # Contas com operações além do horizonte: o saldo já inclui operações ainda não verificadas
+    pending = set((await db.execute(
+        select(Operation.account_id.distinct())
+        .where(Operation.account_id.between(account_ids[0], account_ids[-1]), Operation.id > horizon)
+    )).scalars().all())
+
+    # Apenas as operações posteriores ao checkpoint de cada conta, em lotes
+    result = await db.stream(
+        select(Operation.id, Operation.account_id, Operation.operation_type, Operation.amount, Operation.balance_after)
+        .outerjoin(LedgerCheckpoint, LedgerCheckpoint.account_id == Operation.account_id)
+        .where(
+            Operation.account_id.between(account_ids[0], account_ids[-1]),
+            Operation.id > func.coalesce(LedgerCheckpoint.last_operation_id, 0),
+            Operation.id <= horizon
+        )
+        .order_by(Operation.account_id, Operation.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions():
+        for operation_id, account_id, operation_type, amount, balance_after in partition:
+            previous = last_balance.get(account_id)
+            # A primeira operação de uma conta não tem saldo anterior registrado
+            if previous is not None:
+                expected = previous + _signed_amount(operation_type, amount)
+                if expected != balance_after:
+                    report.mismatches.append(
+                        LedgerMismatch(account_id, operation_id, "chain", expected, balance_after)
+                    )
+            last_balance[account_id] = balance_after
+            last_operation[account_id] = operation_id
+            report.operations_verified += 1
+
+    for account_id, balance in accounts:
+        expected = last_balance.get(account_id)
+        if expected is not None and account_id not in pending and expected != balance:
+            report.mismatches.append(LedgerMismatch(account_id, None, "balance", expected, balance))
+    report.accounts_checked += len(accounts)
+
+    now = datetime.utcnow()
+    values = [
+        {
+            "account_id": account_id,
+            "last_operation_id": operation_id,
+            "last_balance_after": last_balance[account_id],
+            "verified_at": now
+        }
+        for account_id, operation_id in last_operation.items()
+    ]
+    existing = [value for value in values if value["account_id"] in checkpoints]
+    new = [value for value in values if value["account_id"] not in checkpoints]
+    if existing:
+        await db.execute(update(LedgerCheckpoint), existing)
+    if new:
+        await db.execute(insert(LedgerCheckpoint), new)
+    await db.commit()
+    return account_ids[-1]
+
+
+async def verify_ledger(
+    db: AsyncSession,
+    account_chunk_size: int | None = None,
+    batch_size: int | None = None
+) -> LedgerReport:
+    """
+    Verifica se o balance_after de cada operação é o saldo anterior mais o
+    valor da operação, e se o saldo da conta é o balance_after da última.
+
+    A verificação parte do checkpoint de cada conta, lê apenas as operações
+    novas em lotes (sem carregar a tabela em memória) e grava os novos
+    checkpoints a cada grupo de contas.
+
+    Ids são atribuídos antes do commit, então uma operação pode aparecer depois
+    de outras com id maior. A verificação só vai até a última operação mais
+    antiga que LEDGER_SAFETY_LAG_SECONDS (o horizonte), para que o checkpoint
+    não passe de operações ainda em transações abertas. Uma transação mais
+    longa que isso fica abaixo do checkpoint e não tem a cadeia conferida; ela
+    só aparece indiretamente, como divergência do saldo da conta.
+    """
+    account_chunk_size = account_chunk_size or settings.LEDGER_ACCOUNT_CHUNK_SIZE
+    batch_size = batch_size or settings.LEDGER_STREAM_BATCH_SIZE
+    report = LedgerReport()
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.LEDGER_SAFETY_LAG_SECONDS)
+    horizon = (await db.execute(
+        select(func.max(Operation.id)).where(Operation.timestamp <= cutoff)
+    )).scalar() or 0
+    cursor = 0
+    while cursor is not None:
+        cursor = await _verify_chunk(db, cursor, horizon, account_chunk_size, batch_size, report)
+    return report
+
+
+async def run_ledger_verification(account_chunk_size: int | None = None, batch_size: int | None = None) -> LedgerReport:
+    async with SessionLocal() as db:
+        return await verify_ledger(db, account_chunk_size, batch_size)
+
+
+async def _run(args) -> int:
+    while True:
+        report = await run_ledger_verification(args.account_chunk_size, args.batch_size)
+        for mismatch in report.mismatches:
+            print(
+                f"Divergência ({mismatch.kind}) conta {mismatch.account_id} operação {mismatch.operation_id}: "
+                f"esperado {mismatch.expected}, encontrado {mismatch.found}"
+            )
+        print(
+            f"{report.accounts_checked} contas, {report.operations_verified} operações verificadas, "
+            f"{len(report.mismatches)} divergências"
+        )
+        if args.interval is None:
+            return 1 if report.mismatches else 0
+        await asyncio.sleep(args.interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verificação incremental do livro-razão")
+    parser.add_argument("--account-chunk-size", type=int, default=None, help="Contas por transação (padrão: LEDGER_ACCOUNT_CHUNK_SIZE)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Operações por lote lido (padrão: LEDGER_STREAM_BATCH_SIZE)")
+    parser.add_argument("--interval", type=float, default=None, help="Repete a verificação a cada N segundos")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Atualização incremental dos agregados de movimentação por conta e por usuário.
+
+Uso:
+    python -m src.jobs.rollups [--batch-size 50000]
+"""
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import select, insert, delete, func, and_, or_, Date
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.db import SessionLocal, dialect_insert
+from src.models import (
+    ALL_TIME_START, AccountActivityRollup, BankAccount, Operation, RollupPeriod,
+    RollupGap, RollupWatermark, UserActivityRollup
+)
+
+WATERMARK_NAME = "activity_rollups"
+
+logger = logging.getLogger(__name__)
+
+
+async def _upsert_increments(db: AsyncSession, model, increments: dict) -> None:
+    if not increments:
+        return
+    key_columns = [column.name for column in model.__table__.primary_key.columns]
+    rows = [
+        {**dict(zip(key_columns, key)), "count": count, "total": total}
+        for key, (count, total) in increments.items()
+    ]
+    stmt = dialect_insert(db, model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={"count": model.count + stmt.excluded.count, "total": model.total + stmt.excluded.total}
+    )
+    await db.execute(stmt, rows)
+
+
+def _missing_ids(start: int, visible: list[int], limit: int) -> tuple[list[int], int]:
+    """
+    Ids sem operação visível entre start e o último id do lote, até limit.
+    Os mais altos vêm primeiro (transações abertas ficam perto do fim do lote);
+    retorna também quantos ficaram de fora.
+    """
+    missing, skipped = [], 0
+    for previous, current in reversed(list(zip([start, *visible], visible))):
+        hole = current - previous - 1
+        take = max(0, min(hole, limit - len(missing)))
+        missing.extend(range(current - 1, current - 1 - take, -1))
+        skipped += hole - take
+    return missing, skipped
+
+
+async def _refresh_batch(db: AsyncSession, batch_size: int) -> int | None:
+    # Cria a marca d'água sem conflito entre atualizações simultâneas e a bloqueia
+    await db.execute(
+        dialect_insert(db, RollupWatermark)
+        .values(name=WATERMARK_NAME, last_operation_id=0, updated_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    watermark = (await db.execute(
+        select(RollupWatermark)
+        .where(RollupWatermark.name == WATERMARK_NAME)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+    start = watermark.last_operation_id
+
+    now = datetime.utcnow()
+    # Ids pulados em lotes anteriores (transações ainda abertas) que já foram gravados
+    gaps = dict((await db.execute(select(RollupGap.operation_id, RollupGap.detected_at))).all())
+    recovered = (await db.execute(
+        select(Operation.id).where(Operation.id.in_(list(gaps)))
+    )).scalars().all() if gaps else []
+    gap_timeout = now - timedelta(seconds=settings.ROLLUP_GAP_TIMEOUT_SECONDS)
+    expired = [
+        operation_id for operation_id, detected_at in gaps.items()
+        if detected_at < gap_timeout and operation_id not in recovered
+    ]
+
+    # Ids são atribuídos antes do commit: o lote para antes da primeira operação
+    # recente demais e termina na maior operação visível anterior a ela
+    cutoff = now - timedelta(seconds=settings.ROLLUP_SAFETY_LAG_SECONDS)
+    first_recent = (await db.execute(
+        select(func.min(Operation.id)).where(Operation.id > start, Operation.timestamp > cutoff)
+    )).scalar()
+    batch = select(Operation.id).where(Operation.id > start)
+    if first_recent is not None:
+        batch = batch.where(Operation.id < first_recent)
+    visible = (await db.execute(batch.order_by(Operation.id).limit(batch_size))).scalars().all()
+    if expired:
+        await db.execute(delete(RollupGap).where(RollupGap.operation_id.in_(expired)))
+    if not visible and not recovered:
+        await db.commit()
+        return None
+    end = visible[-1] if visible else start
+
+    # Ids do lote ainda não visíveis ficam registrados para os próximos lotes, até
+    # ROLLUP_MAX_GAPS pendentes: saltos grandes (cache da sequence, importações)
+    # não são transações abertas e não devem encher a tabela
+    pending = len(gaps) - len(recovered) - len(expired)
+    missing, skipped = _missing_ids(start, visible, max(0, settings.ROLLUP_MAX_GAPS - pending))
+    if skipped:
+        logger.warning(
+            "Limite de ROLLUP_MAX_GAPS atingido: %d ids sem operação entre %d e %d não serão acompanhados",
+            skipped, start, end
+        )
+    if missing:
+        await db.execute(insert(RollupGap), [{"operation_id": operation_id, "detected_at": now} for operation_id in missing])
+    if recovered:
+        await db.execute(delete(RollupGap).where(RollupGap.operation_id.in_(recovered)))
+
+    day = func.date(Operation.timestamp, type_=Date)
+    groups = (await db.execute(
+        select(
+            Operation.account_id,
+            BankAccount.user_id,
+            BankAccount.account_type,
+            day,
+            Operation.operation_type,
+            func.count(),
+            func.sum(Operation.amount)
+        )
+        .join(BankAccount, BankAccount.id == Operation.account_id)
+        .where(or_(and_(Operation.id > start, Operation.id <= end), Operation.id.in_(recovered)))
+        .group_by(Operation.account_id, BankAccount.user_id, BankAccount.account_type, day, Operation.operation_type)
+    )).all()
+
+    account_increments = defaultdict(lambda: [0, Decimal("0")])
+    user_increments = defaultdict(lambda: [0, Decimal("0")])
+    for account_id, user_id, account_type, operation_day, operation_type, count, total in groups:
+        for period, period_start in (
+            (RollupPeriod.DAY.value, operation_day),
+            (RollupPeriod.MONTH.value, operation_day.replace(day=1)),
+            (RollupPeriod.ALL.value, ALL_TIME_START),
+        ):
+            for increments, key in (
+                (account_increments, (account_id, period, period_start, operation_type)),
+                (user_increments, (user_id, account_type, period, period_start, operation_type)),
+            ):
+                increments[key][0] += count
+                increments[key][1] += Decimal(str(total))
+
+    await _upsert_increments(db, AccountActivityRollup, account_increments)
+    await _upsert_increments(db, UserActivityRollup, user_increments)
+
+    watermark.last_operation_id = end
+    watermark.updated_at = now
+    await db.commit()
+    return end
+
+
+async def refresh_rollups(db: AsyncSession, batch_size: int | None = None) -> int:
+    """
+    Incorpora aos agregados as operações posteriores à marca d'água.
+
+    As operações novas são agrupadas no banco por conta, dia e tipo, e os
+    incrementos de dia, mês e histórico completo são somados aos agregados com
+    upserts. Cada lote avança a marca d'água na mesma transação, então a
+    atualização pode ser interrompida e repetida sem contar operações duas vezes.
+    Ids que a marca d'água ultrapassa sem que a operação esteja visível são
+    guardados em rollup_gaps e incorporados quando a transação confirmar.
+    Retorna o id da última operação incorporada.
+    """
+    batch_size = batch_size or settings.ROLLUP_BATCH_SIZE
+    last_operation_id = 0
+    while (end := await _refresh_batch(db, batch_size)) is not None:
+        last_operation_id = end
+    return last_operation_id or await rollup_watermark(db)
+
+
+async def rollup_watermark(db: AsyncSession) -> int:
+    """Id da última operação incorporada aos agregados"""
+    watermark = await db.get(RollupWatermark, WATERMARK_NAME)
+    return watermark.last_operation_id if watermark else 0
+
+
+async def run_rollup_refresh(batch_size: int | None = None) -> int:
+    async with SessionLocal() as db:
+        return await refresh_rollups(db, batch_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Atualização dos agregados de movimentação")
+    parser.add_argument("--batch-size", type=int, default=None, help="Operações por lote (padrão: ROLLUP_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    last_operation_id = asyncio.run(run_rollup_refresh(args.batch_size))
+    print(f"Agregados atualizados até a operação {last_operation_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi_pagination import add_pagination
 from contextlib import asynccontextmanager
+from sqlalchemy.exc import DBAPIError
 from src.core.config import settings
+from src.core.cancellation import CancelOnDisconnectMiddleware
+from src.core.profiling import ProfilingMiddleware, install_sql_timing
 from src.api.routes import router
-from src.db import engine
+from src.db import engine, db_stats, is_statement_timeout
 from src.models import Base
 
 
+install_sql_timing(engine.sync_engine)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
@@ -20,5 +27,20 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+
+
+@app.exception_handler(DBAPIError)
+async def database_error_handler(request: Request, exc: DBAPIError):
+    if not is_statement_timeout(exc):
+        raise exc
+    db_stats["statement_timeouts"] += 1
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Tempo limite da consulta excedido"}
+    )
+
+
+app.add_middleware(CancelOnDisconnectMiddleware)
+app.add_middleware(ProfilingMiddleware)
 app.include_router(router)
 add_pagination(app)
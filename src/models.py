@@ -1,12 +1,36 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, Numeric, DateTime, ForeignKey, Enum as SQLEnum
-from datetime import datetime
+from sqlalchemy import String, Integer, Numeric, Date, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.types import TypeDecorator
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 from typing import List
 
 class Base(DeclarativeBase):
     pass
 
+
+class Money(TypeDecorator):
+    """
+    Valor monetário com duas casas decimais.
+
+    No PostgreSQL é um NUMERIC(12, 2) nativo. O SQLite não tem tipo decimal,
+    então o valor é arredondado para centavos antes de ser gravado, garantindo
+    que os dois bancos armazenem e retornem exatamente o mesmo valor.
+    """
+    impl = Numeric(12, 2)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def enum_type(enum_class: type[Enum], name: str) -> SQLEnum:
+    """Enum nativo no PostgreSQL e VARCHAR com CHECK nos bancos sem tipo enum"""
+    return SQLEnum(enum_class, name=name, create_constraint=True, validate_strings=True)
+
 class Item(Base):
     __tablename__ = "items"
 
@@ -25,6 +49,18 @@ class OperationType(str, Enum):
     DEPOSIT = "deposit"
     WITHDRAWAL = "withdrawal"
     TRANSFER = "transfer"
+    INTEREST = "interest"
+
+
+class RollupPeriod(str, Enum):
+    """Períodos dos agregados de movimentação"""
+    DAY = "day"
+    MONTH = "month"
+    ALL = "all"
+
+
+# period_start dos agregados de todo o histórico (RollupPeriod.ALL)
+ALL_TIME_START = date(1970, 1, 1)
 
 
 class BankAccount(Base):
@@ -33,13 +69,13 @@ class BankAccount(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
-    balance: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False, default=0.0)
+    balance: Mapped[float] = mapped_column(Money, nullable=False, default=0.0)
     account_type: Mapped[str] = mapped_column(
-        SQLEnum(AccountType, name="account_type_enum", create_type=True),
+        enum_type(AccountType, "account_type_enum"),
         nullable=False,
         default=AccountType.CHECKING.value
     )
-    daily_limit: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False, default=1000.0)
+    daily_limit: Mapped[float] = mapped_column(Money, nullable=False, default=1000.0)
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -49,16 +85,86 @@ class BankAccount(Base):
 class Operation(Base):
     """Modelo de Operação Bancária"""
     __tablename__ = "operations"
+    __table_args__ = (
+        # Última operação por conta (ETag) e varreduras ordenadas por conta
+        Index("ix_operations_account_id_id", "account_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     account_id: Mapped[int] = mapped_column(Integer, ForeignKey("bank_accounts.id"), nullable=False, index=True)
     operation_type: Mapped[str] = mapped_column(
-        SQLEnum(OperationType, name="operation_type_enum", create_type=True),
+        enum_type(OperationType, "operation_type_enum"),
         nullable=False
     )
-    amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
-    balance_after: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    amount: Mapped[float] = mapped_column(Money, nullable=False)
+    balance_after: Mapped[float] = mapped_column(Money, nullable=False)
     description: Mapped[str] = mapped_column(String(255), nullable=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     account: Mapped["BankAccount"] = relationship("BankAccount", back_populates="operations")
+
+
+class InterestAccrual(Base):
+    """Execução da apuração de juros das contas poupança para uma data"""
+    __tablename__ = "interest_accruals"
+
+    accrual_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    rate: Mapped[float] = mapped_column(Numeric(9, 6), nullable=False)
+    last_account_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    accounts_processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_interest: Mapped[float] = mapped_column(Money, nullable=False, default=0.0)
+    completed: Mapped[bool] = mapped_column(default=False, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+class LedgerCheckpoint(Base):
+    """Última operação verificada da cadeia de saldos de uma conta"""
+    __tablename__ = "ledger_checkpoints"
+
+    account_id: Mapped[int] = mapped_column(Integer, ForeignKey("bank_accounts.id"), primary_key=True)
+    last_operation_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_balance_after: Mapped[float] = mapped_column(Money, nullable=False)
+    verified_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class AccountActivityRollup(Base):
+    """Quantidade e volume de operações de uma conta por período"""
+    __tablename__ = "account_activity_rollups"
+
+    account_id: Mapped[int] = mapped_column(Integer, ForeignKey("bank_accounts.id"), primary_key=True)
+    period: Mapped[str] = mapped_column(String(5), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    operation_type: Mapped[str] = mapped_column(enum_type(OperationType, "operation_type_enum"), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[float] = mapped_column(Numeric(18, 2), nullable=False, default=0.0)
+
+
+class UserActivityRollup(Base):
+    """Quantidade e volume de operações de um usuário por tipo de conta e período"""
+    __tablename__ = "user_activity_rollups"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    account_type: Mapped[str] = mapped_column(enum_type(AccountType, "account_type_enum"), primary_key=True)
+    period: Mapped[str] = mapped_column(String(5), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    operation_type: Mapped[str] = mapped_column(enum_type(OperationType, "operation_type_enum"), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[float] = mapped_column(Numeric(18, 2), nullable=False, default=0.0)
+
+
+class RollupWatermark(Base):
+    """Última operação já incorporada aos agregados"""
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    last_operation_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RollupGap(Base):
+    """Id de operação ainda não visível quando a marca d'água passou por ele"""
+    __tablename__ = "rollup_gaps"
+
+    operation_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    detected_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,9 +1,19 @@
 import asyncio
+import os
+import bcrypt
 import pytest
-from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Por padrão os testes rodam em um SQLite em memória por processo, o que permite
+# executá-los em paralelo (pytest -n auto). Exporte DATABASE_URL para usar o PostgreSQL.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
 from src.main import app
 from src.core.config import settings
+from src.core.profiling import ProfiledSession
+from src.db import engine as app_engine, get_db
 from src.models import Base
 
 @pytest.fixture(scope="session")
@@ -14,27 +24,82 @@ def event_loop():
 
 @pytest.fixture(scope="session")
 async def engine():
-    engine = create_async_engine(settings.DATABASE_URL)
-    async with engine.begin() as conn:
+    async with app_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    yield engine
-    async with engine.begin() as conn:
+    yield app_engine
+    async with app_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
-    await engine.dispose()
+    await app_engine.dispose()
 
 @pytest.fixture
-async def db_session(engine):
-    Session = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
-    async with Session() as session:
+async def connection(engine):
+    """Conexão com uma transação externa desfeita ao final de cada teste"""
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        yield conn
+        await transaction.rollback()
+
+def _session(connection) -> AsyncSession:
+    # Os commits da aplicação viram SAVEPOINTs dentro da transação do teste
+    return AsyncSession(
+        bind=connection,
+        sync_session_class=ProfiledSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint"
+    )
+
+@pytest.fixture
+async def db_session(connection):
+    async with _session(connection) as session:
         yield session
-        await session.rollback()
 
 @pytest.fixture
-async def client():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+async def client(connection):
+    async def override_get_db():
+        async with _session(connection) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True) as ac:
         yield ac
+    app.dependency_overrides.pop(get_db, None)
 
 @pytest.fixture
 async def access_token(client: AsyncClient):
     resp = await client.post("/auth/login", json={"username": "tester"})
     return resp.json()["access_token"]
+
+@pytest.fixture
+async def admin_token(client: AsyncClient, monkeypatch):
+    hashed = bcrypt.hashpw(b"senha-admin", bcrypt.gensalt(rounds=4)).decode()
+    monkeypatch.setattr(settings, "ADMIN_PASSWORD_HASHES", {"admin": hashed})
+    resp = await client.post("/auth/login", json={"username": "admin", "password": "senha-admin"})
+    return resp.json()["access_token"]
+
+
+async def create_account(
+    client: AsyncClient,
+    headers: dict,
+    user_id: int,
+    account_type: str = "checking",
+    balance: float = 0.0
+) -> int:
+    """Cria uma conta pela API e retorna o id"""
+    response = await client.post(
+        "/accounts",
+        json={"user_id": user_id, "account_type": account_type, "initial_balance": balance},
+        headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def operate(client: AsyncClient, headers: dict, account_id: int, operation_type: str, amount: float) -> None:
+    """Faz um depósito ou saque pela API"""
+    path = "/operations/deposit" if operation_type == "deposit" else "/operations/withdraw"
+    response = await client.post(
+        path,
+        json={"account_id": account_id, "operation_type": operation_type, "amount": amount},
+        headers=headers
+    )
+    assert response.status_code == 201
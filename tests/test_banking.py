@@ -1,5 +1,7 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+from src.db import engine
 
 
 @pytest.mark.asyncio
@@ -172,3 +174,36 @@ async def test_list_accounts(client: AsyncClient, access_token: str):
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 2
+
+
+@pytest.mark.asyncio
+async def test_operations_do_not_load_account_history(client: AsyncClient, access_token: str):
+    """Testa que depósito e saque não carregam o histórico de operações da conta"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    account_response = await client.post(
+        "/accounts",
+        json={"user_id": 7, "account_type": "checking", "initial_balance": 100.0},
+        headers=headers
+    )
+    account_id = account_response.json()["id"]
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for path, operation_type in (("/operations/deposit", "deposit"), ("/operations/withdraw", "withdrawal")):
+            response = await client.post(
+                path,
+                json={"account_id": account_id, "operation_type": operation_type, "amount": 10.0},
+                headers=headers
+            )
+            assert response.status_code == 201
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not any("operations.account_id IN" in statement for statement in statements)
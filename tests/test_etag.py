@@ -0,0 +1,103 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_statement_not_modified(client: AsyncClient, access_token: str):
+    """Testa o 304 do extrato e a invalidação do ETag por depósito e saque"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    account_response = await client.post(
+        "/accounts",
+        json={"user_id": 1, "account_type": "checking", "initial_balance": 100.0},
+        headers=headers
+    )
+    account_id = account_response.json()["id"]
+
+    first = await client.get(f"/operations/{account_id}/statement", headers=headers)
+    etag = first.headers["etag"]
+
+    cached = await client.get(
+        f"/operations/{account_id}/statement",
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    other_page = await client.get(
+        f"/operations/{account_id}/statement?offset=10",
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert other_page.status_code == 200
+
+    await client.post(
+        "/operations/deposit",
+        json={"account_id": account_id, "operation_type": "deposit", "amount": 50.0},
+        headers=headers
+    )
+    after_deposit = await client.get(
+        f"/operations/{account_id}/statement",
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert after_deposit.status_code == 200
+    assert after_deposit.json()["total_operations"] == 1
+    assert after_deposit.headers["etag"] != etag
+
+    etag = after_deposit.headers["etag"]
+    await client.post(
+        "/operations/withdraw",
+        json={"account_id": account_id, "operation_type": "withdrawal", "amount": 20.0},
+        headers=headers
+    )
+    after_withdraw = await client.get(
+        f"/operations/{account_id}/statement",
+        headers={**headers, "If-None-Match": etag}
+    )
+    assert after_withdraw.status_code == 200
+    assert after_withdraw.json()["account"]["balance"] == 130.0
+
+
+@pytest.mark.asyncio
+async def test_account_not_modified(client: AsyncClient, access_token: str):
+    """Testa o 304 da conta e a invalidação do ETag pela desativação"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    account_response = await client.post(
+        "/accounts",
+        json={"user_id": 2, "account_type": "savings"},
+        headers=headers
+    )
+    account_id = account_response.json()["id"]
+
+    first = await client.get(f"/accounts/{account_id}", headers=headers)
+    etag = first.headers["etag"]
+
+    cached = await client.get(f"/accounts/{account_id}", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    await client.patch(f"/accounts/{account_id}/deactivate", headers=headers)
+
+    after_deactivate = await client.get(f"/accounts/{account_id}", headers={**headers, "If-None-Match": etag})
+    assert after_deactivate.status_code == 200
+    assert after_deactivate.json()["is_active"] is False
+
+
+@pytest.mark.asyncio
+async def test_statement_of_deactivated_account_is_not_cached(client: AsyncClient, access_token: str):
+    """Testa que o extrato de conta desativada não responde 304"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    account_response = await client.post(
+        "/accounts",
+        json={"user_id": 3, "account_type": "checking"},
+        headers=headers
+    )
+    account_id = account_response.json()["id"]
+    await client.patch(f"/accounts/{account_id}/deactivate", headers=headers)
+
+    response = await client.get(
+        f"/operations/{account_id}/statement",
+        headers={**headers, "If-None-Match": "*"}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,96 @@
+import pytest
+from datetime import date, datetime
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.jobs.interest import accrue_interest, start_accrual
+from src.jobs.ledger import verify_ledger
+from src.jobs.rollups import refresh_rollups
+from src.models import BankAccount, InterestAccrual, Operation, OperationType
+from tests.conftest import create_account, operate
+
+
+@pytest.mark.asyncio
+async def test_accrue_interest_on_savings(client: AsyncClient, access_token: str, db_session: AsyncSession):
+    """Testa a apuração de juros apenas nas contas poupança ativas"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    savings_ids = [await create_account(client, headers, user_id, "savings", 1000.0) for user_id in (1, 2, 3)]
+    checking_id = await create_account(client, headers, 4, "checking", 1000.0)
+    empty_id = await create_account(client, headers, 5, "savings", 0.0)
+
+    started_at = datetime.utcnow()
+    run = await accrue_interest(db_session, date(2026, 1, 31), rate=0.01, chunk_size=2)
+
+    assert run.completed is True
+    assert run.accounts_processed == 3
+    assert float(run.total_interest) == 30.0
+
+    balances = dict((await db_session.execute(select(BankAccount.id, BankAccount.balance))).all())
+    assert all(float(balances[account_id]) == 1010.0 for account_id in savings_ids)
+    assert float(balances[checking_id]) == 1000.0
+    assert float(balances[empty_id]) == 0.0
+
+    operations = (await db_session.execute(select(Operation))).scalars().all()
+    assert sorted(op.account_id for op in operations) == savings_ids
+    assert all(float(op.amount) == 10.0 and float(op.balance_after) == 1010.0 for op in operations)
+    assert all(op.description == "Juros 2026-01-31" and op.timestamp >= started_at for op in operations)
+    assert all(op.operation_type == OperationType.INTEREST for op in operations)
+
+
+@pytest.mark.asyncio
+async def test_interest_is_not_reported_as_deposits(client: AsyncClient, access_token: str, db_session: AsyncSession, monkeypatch):
+    """Testa que os juros ficam fora do volume de depósitos e passam na verificação do livro-razão"""
+    monkeypatch.setattr(settings, "ROLLUP_SAFETY_LAG_SECONDS", 0)
+    monkeypatch.setattr(settings, "LEDGER_SAFETY_LAG_SECONDS", 0)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account(client, headers, 6, "savings", 1000.0)
+    await operate(client, headers, account_id, "deposit", 100.0)
+
+    await accrue_interest(db_session, date(2026, 1, 31), rate=0.01)
+    await refresh_rollups(db_session)
+
+    summary = (await client.get(f"/accounts/{account_id}/summary", headers=headers)).json()
+    assert summary["all_time"]["deposits"] == {"count": 1, "total": 100.0}
+    assert summary["all_time"]["interest"] == {"count": 1, "total": 11.0}
+    assert (await verify_ledger(db_session)).mismatches == []
+
+
+@pytest.mark.asyncio
+async def test_accrue_interest_is_idempotent(client: AsyncClient, access_token: str, db_session: AsyncSession):
+    """Testa que a mesma data não é apurada duas vezes"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account(client, headers, 1, "savings", 500.0)
+
+    await accrue_interest(db_session, date(2026, 1, 31), rate=0.02)
+    await accrue_interest(db_session, date(2026, 1, 31), rate=0.02)
+
+    account = await db_session.get(BankAccount, account_id, populate_existing=True)
+    assert float(account.balance) == 510.0
+
+    statement = await client.get(f"/operations/{account_id}/statement", headers=headers)
+    assert statement.json()["total_operations"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rate", [-0.01, 0, 5])
+async def test_accrue_interest_rejects_invalid_rate(client: AsyncClient, admin_token: str, db_session: AsyncSession, rate: float):
+    """Testa que uma taxa fora dos limites não inicia a apuração da data"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await client.post(f"/admin/interest/accrue?accrual_date=2026-02-28&rate={rate}", headers=headers)
+    assert response.status_code == 422
+
+    with pytest.raises(ValueError):
+        await start_accrual(db_session, date(2026, 2, 28), rate)
+    assert await db_session.get(InterestAccrual, date(2026, 2, 28)) is None
+
+
+@pytest.mark.asyncio
+async def test_start_accrual_keeps_existing_run(db_session: AsyncSession):
+    """Testa que iniciar uma data já criada não falha e mantém a execução original"""
+    first = await start_accrual(db_session, date(2026, 3, 31), rate=0.01)
+    second = await start_accrual(db_session, date(2026, 3, 31), rate=0.02)
+
+    assert second is first
+    assert float(second.rate) == 0.01
@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.jobs.ledger import verify_ledger
+from src.models import BankAccount, Operation, OperationType
+from tests.conftest import create_account, operate
+
+
+@pytest.fixture(autouse=True)
+def no_safety_lag(monkeypatch):
+    monkeypatch.setattr(settings, "LEDGER_SAFETY_LAG_SECONDS", 0)
+
+
+async def create_account_with_operations(client: AsyncClient, headers: dict, user_id: int) -> int:
+    account_id = await create_account(client, headers, user_id, balance=100.0)
+    await operate(client, headers, account_id, "deposit", 50.0)
+    await operate(client, headers, account_id, "withdrawal", 30.0)
+    return account_id
+
+
+@pytest.mark.asyncio
+async def test_verify_ledger_incremental(client: AsyncClient, access_token: str, db_session: AsyncSession):
+    """Testa que a verificação processa apenas operações novas a cada execução"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_ids = [await create_account_with_operations(client, headers, user_id) for user_id in (1, 2, 3)]
+
+    report = await verify_ledger(db_session, account_chunk_size=2, batch_size=2)
+    assert report.accounts_checked == 3
+    assert report.operations_verified == 6
+    assert report.mismatches == []
+
+    await operate(client, headers, account_ids[0], "deposit", 10.0)
+
+    report = await verify_ledger(db_session)
+    assert report.operations_verified == 1
+    assert report.mismatches == []
+
+
+@pytest.mark.asyncio
+async def test_verify_ledger_reports_mismatches(client: AsyncClient, access_token: str, db_session: AsyncSession):
+    """Testa a detecção de divergências na cadeia e no saldo da conta"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account_with_operations(client, headers, 1)
+    other_id = await create_account_with_operations(client, headers, 2)
+
+    await db_session.execute(
+        update(Operation)
+        .where(Operation.account_id == account_id, Operation.operation_type == "withdrawal")
+        .values(balance_after=125.0)
+    )
+    await db_session.execute(
+        update(BankAccount).where(BankAccount.id == other_id).values(balance=999.0)
+    )
+    await db_session.commit()
+
+    report = await verify_ledger(db_session)
+
+    mismatches = {(m.account_id, m.kind): m for m in report.mismatches}
+    assert len(mismatches) == 3
+    assert float(mismatches[(account_id, "chain")].expected) == 120.0
+    assert float(mismatches[(account_id, "chain")].found) == 125.0
+    assert float(mismatches[(account_id, "balance")].found) == 120.0
+    assert float(mismatches[(other_id, "balance")].expected) == 120.0
+
+
+@pytest.mark.asyncio
+async def test_verify_ledger_checks_late_committed_operations(
+    client: AsyncClient, access_token: str, db_session: AsyncSession, monkeypatch
+):
+    """Testa que o checkpoint não passa de um id ainda não gravado anterior a uma operação recente"""
+    monkeypatch.setattr(settings, "LEDGER_SAFETY_LAG_SECONDS", 60)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account_with_operations(client, headers, 1)
+    await db_session.execute(update(Operation).values(timestamp=datetime.utcnow() - timedelta(hours=1)))
+    base = (await db_session.execute(select(func.max(Operation.id)))).scalar()
+
+    def operation(operation_id: int, balance_after: float, timestamp: datetime) -> Operation:
+        return Operation(
+            id=operation_id,
+            account_id=account_id,
+            operation_type=OperationType.DEPOSIT.value,
+            amount=10.0,
+            balance_after=balance_after,
+            timestamp=timestamp
+        )
+
+    # base + 1 recebeu o id antes de base + 2, mas só é gravada depois da verificação
+    db_session.add(operation(base + 2, 140.0, datetime.utcnow()))
+    await db_session.execute(update(BankAccount).where(BankAccount.id == account_id).values(balance=140.0))
+    await db_session.commit()
+
+    report = await verify_ledger(db_session)
+    assert report.operations_verified == 2
+    assert report.mismatches == []
+
+    db_session.add(operation(base + 1, 999.0, datetime.utcnow() - timedelta(minutes=5)))
+    await db_session.commit()
+    monkeypatch.setattr(settings, "LEDGER_SAFETY_LAG_SECONDS", 0)
+
+    report = await verify_ledger(db_session)
+    chain = [m for m in report.mismatches if m.kind == "chain"]
+    assert [m.operation_id for m in chain] == [base + 1, base + 2]
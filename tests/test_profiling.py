@@ -0,0 +1,113 @@
+import pytest
+from httpx import AsyncClient
+from src.core import profiling
+from src.core.config import settings
+
+
+@pytest.fixture
+def admin(admin_token: str):
+    profiling.profiles.clear()
+    return admin_token
+
+
+@pytest.mark.asyncio
+async def test_profiling_with_admin_header(client: AsyncClient, admin: str):
+    """Testa o profiling ativado pelo header assinado por um administrador"""
+    headers = {"Authorization": f"Bearer {admin}"}
+
+    response = await client.post(
+        "/auth/login",
+        json={"username": "outro"},
+        headers={settings.PROFILING_HEADER: admin}
+    )
+    assert response.status_code == 200
+
+    profiles_response = await client.get("/admin/profiles", headers=headers)
+
+    assert profiles_response.status_code == 200
+    data = profiles_response.json()
+    assert len(data) == 1
+    assert data[0]["path"] == "/auth/login"
+    assert data[0]["trigger"] == "header"
+    assert data[0]["status_code"] == 200
+    assert data[0]["jwt_ms"] > 0
+    assert data[0]["serialization_ms"] > 0
+    assert "internal time" in data[0]["call_profile"]
+    assert "base_events.py" not in data[0]["call_profile"]
+    assert data[0]["call_profile_skipped"] is False
+
+
+@pytest.mark.asyncio
+async def test_profiling_measures_sql_and_orm(client: AsyncClient, access_token: str, admin: str):
+    """Testa a medição de SQL e ORM da requisição perfilada"""
+    response = await client.post(
+        "/accounts",
+        json={"user_id": 1, "account_type": "checking"},
+        headers={"Authorization": f"Bearer {access_token}", settings.PROFILING_HEADER: admin}
+    )
+    assert response.status_code == 201
+
+    profile = profiling.profiles[-1]
+    assert profile.sql_count > 0
+    assert profile.sql_ms > 0
+    assert profile.orm_ms > 0
+    assert profile.jwt_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_profiling_while_profiler_is_busy(client: AsyncClient, admin: str, monkeypatch):
+    """Testa que uma requisição perfilada enquanto o cProfile está em uso é registrada sem call profile"""
+    monkeypatch.setattr(profiling, "_profiler_busy", True)
+
+    response = await client.post(
+        "/auth/login",
+        json={"username": "outro"},
+        headers={settings.PROFILING_HEADER: admin}
+    )
+    assert response.status_code == 200
+
+    profile = profiling.profiles[-1]
+    assert profile.call_profile_skipped is True
+    assert profile.call_profile == ""
+    assert profile.jwt_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_profiling_disabled_by_default(client: AsyncClient, admin: str):
+    """Testa que requisições sem header ou amostragem não são perfiladas"""
+    headers = {"Authorization": f"Bearer {admin}"}
+
+    await client.post("/auth/login", json={"username": "outro"})
+    await client.post(
+        "/auth/login",
+        json={"username": "outro"},
+        headers={settings.PROFILING_HEADER: "token-invalido"}
+    )
+
+    profiles_response = await client.get("/admin/profiles", headers=headers)
+    assert profiles_response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_profiles_endpoint_requires_admin(client: AsyncClient, access_token: str):
+    """Testa que apenas administradores leem os perfis"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = await client.get("/admin/profiles", headers=headers)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_token_requires_password(client: AsyncClient, admin: str):
+    """Testa que o nome de um administrador sem a senha não dá acesso às rotas de admin"""
+    login = await client.post("/auth/login", json={"username": "admin"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    response = await client.get("/admin/profiles", headers=headers)
+    assert response.status_code == 403
+
+    wrong_password = await client.post("/auth/login", json={"username": "admin", "password": "errada"})
+    assert wrong_password.status_code == 401
+    not_admin = await client.post("/auth/login", json={"username": "tester", "password": "senha-admin"})
+    assert not_admin.status_code == 401
@@ -0,0 +1,179 @@
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy import event, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.db import engine
+from src.jobs.rollups import refresh_rollups
+from src.models import Operation, OperationType, RollupGap
+from tests.conftest import create_account, operate
+
+
+@pytest.fixture(autouse=True)
+def no_safety_lag(monkeypatch):
+    monkeypatch.setattr(settings, "ROLLUP_SAFETY_LAG_SECONDS", 0)
+
+
+async def insert_operation(db: AsyncSession, operation_id: int, account_id: int, timestamp: datetime) -> None:
+    db.add(Operation(
+        id=operation_id,
+        account_id=account_id,
+        operation_type=OperationType.DEPOSIT.value,
+        amount=1.0,
+        balance_after=1.0,
+        timestamp=timestamp
+    ))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_account_and_user_summary(client: AsyncClient, access_token: str, db_session: AsyncSession):
+    """Testa os resumos por conta e por usuário a partir dos agregados"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    checking_id = await create_account(client, headers, 7, "checking", 500.0)
+    savings_id = await create_account(client, headers, 7, "savings")
+
+    await operate(client, headers, checking_id, "deposit", 100.0)
+    await operate(client, headers, checking_id, "deposit", 50.0)
+    await operate(client, headers, checking_id, "withdrawal", 30.0)
+    await operate(client, headers, savings_id, "deposit", 200.0)
+
+    last_operation_id = await refresh_rollups(db_session, batch_size=2)
+
+    response = await client.get(f"/accounts/{checking_id}/summary", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["refreshed_through_operation_id"] == last_operation_id
+    for period in ("day", "month", "all_time"):
+        assert data[period]["deposits"] == {"count": 2, "total": 150.0}
+        assert data[period]["withdrawals"] == {"count": 1, "total": 30.0}
+
+    response = await client.get("/users/7/summary", headers=headers)
+    assert response.status_code == 200
+    summaries = {item["account_type"]: item for item in response.json()["account_types"]}
+    assert summaries["checking"]["month"]["deposits"] == {"count": 2, "total": 150.0}
+    assert summaries["savings"]["all_time"]["deposits"] == {"count": 1, "total": 200.0}
+    assert summaries["savings"]["day"]["withdrawals"] == {"count": 0, "total": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_is_incremental(client: AsyncClient, access_token: str, db_session: AsyncSession):
+    """Testa que cada operação é incorporada aos agregados uma única vez"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account(client, headers, 8)
+
+    await operate(client, headers, account_id, "deposit", 10.0)
+    await refresh_rollups(db_session)
+    await refresh_rollups(db_session)
+    await operate(client, headers, account_id, "deposit", 5.0)
+    await refresh_rollups(db_session)
+
+    response = await client.get(f"/accounts/{account_id}/summary", headers=headers)
+    assert response.json()["all_time"]["deposits"] == {"count": 2, "total": 15.0}
+
+    other_day = await client.get(f"/accounts/{account_id}/summary?day=2000-01-01", headers=headers)
+    assert other_day.json()["day"]["deposits"] == {"count": 0, "total": 0.0}
+    assert other_day.json()["all_time"]["deposits"] == {"count": 2, "total": 15.0}
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_picks_up_skipped_ids(client: AsyncClient, access_token: str, db_session: AsyncSession):
+    """Testa que um id ainda não gravado quando a marca d'água passou é incorporado depois"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account(client, headers, 10)
+    base = (await db_session.execute(select(func.max(Operation.id)))).scalar() or 0
+    now = datetime.utcnow()
+
+    await insert_operation(db_session, base + 1, account_id, now)
+    await insert_operation(db_session, base + 3, account_id, now)
+    assert await refresh_rollups(db_session) == base + 3
+    assert await db_session.get(RollupGap, base + 2) is not None
+
+    # Transação que recebeu o id antes e confirmou depois da atualização
+    await insert_operation(db_session, base + 2, account_id, now)
+    await refresh_rollups(db_session)
+
+    response = await client.get(f"/accounts/{account_id}/summary", headers=headers)
+    assert response.json()["all_time"]["deposits"] == {"count": 3, "total": 3.0}
+    assert await db_session.get(RollupGap, base + 2, populate_existing=True) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_caps_tracked_gaps(
+    client: AsyncClient, access_token: str, db_session: AsyncSession, monkeypatch, caplog
+):
+    """Testa que um salto grande de ids não registra um gap por id"""
+    monkeypatch.setattr(settings, "ROLLUP_MAX_GAPS", 10)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account(client, headers, 12)
+    base = (await db_session.execute(select(func.max(Operation.id)))).scalar() or 0
+    now = datetime.utcnow()
+
+    await insert_operation(db_session, base + 1, account_id, now)
+    await insert_operation(db_session, base + 100_000, account_id, now)
+    assert await refresh_rollups(db_session) == base + 100_000
+
+    gaps = (await db_session.execute(select(RollupGap.operation_id))).scalars().all()
+    assert sorted(gaps) == list(range(base + 99_990, base + 100_000))
+    assert "ROLLUP_MAX_GAPS" in caplog.text
+
+    response = await client.get(f"/accounts/{account_id}/summary", headers=headers)
+    assert response.json()["all_time"]["deposits"] == {"count": 2, "total": 2.0}
+
+
+@pytest.mark.asyncio
+async def test_refresh_rollups_stops_before_recent_operations(
+    client: AsyncClient, access_token: str, db_session: AsyncSession, monkeypatch
+):
+    """Testa que a marca d'água não passa de um id faltante anterior a uma operação recente"""
+    monkeypatch.setattr(settings, "ROLLUP_SAFETY_LAG_SECONDS", 60)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account(client, headers, 11)
+    base = (await db_session.execute(select(func.max(Operation.id)))).scalar() or 0
+    now = datetime.utcnow()
+
+    await insert_operation(db_session, base + 1, account_id, now - timedelta(hours=1))
+    await insert_operation(db_session, base + 3, account_id, now)
+    assert await refresh_rollups(db_session) == base + 1
+
+    await insert_operation(db_session, base + 2, account_id, now - timedelta(hours=1))
+    assert await refresh_rollups(db_session) == base + 2
+
+    monkeypatch.setattr(settings, "ROLLUP_SAFETY_LAG_SECONDS", 0)
+    assert await refresh_rollups(db_session) == base + 3
+    response = await client.get(f"/accounts/{account_id}/summary", headers=headers)
+    assert response.json()["all_time"]["deposits"] == {"count": 3, "total": 3.0}
+
+
+@pytest.mark.asyncio
+async def test_account_summary_not_found(client: AsyncClient, access_token: str):
+    """Testa o resumo de uma conta inexistente"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = await client.get("/accounts/999999/summary", headers=headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_account_summary_does_not_read_operations(client: AsyncClient, access_token: str):
+    """Testa que o resumo da conta não consulta a tabela de operações"""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    account_id = await create_account(client, headers, 9)
+    await operate(client, headers, account_id, "deposit", 10.0)
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(f"/accounts/{account_id}/summary", headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert statements
+    assert not any("FROM operations" in statement for statement in statements)
@@ -0,0 +1,154 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.exc import DBAPIError
+from starlette.requests import Request
+from src.core.cancellation import CancelOnDisconnectMiddleware
+from src.core.config import settings
+from src.core.security import create_access_token
+from src import db
+from src.db import _apply_statement_timeout, asyncpg_connect_args, build_engine, db_stats, statement_timeout_for
+from src.main import app, database_error_handler
+from src.models import Base
+
+
+class QueryCanceledError(Exception):
+    sqlstate = "57014"
+
+
+def make_request(endpoint) -> Request:
+    return Request({"type": "http", "method": "GET", "headers": [], "endpoint": endpoint})
+
+
+def test_statement_timeout_per_route(monkeypatch):
+    """Testa o timeout configurado por endpoint e o padrão"""
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "ROUTE_STATEMENT_TIMEOUTS_MS", {"list_operations": 1500})
+
+    async def list_operations(): ...
+    async def withdraw(): ...
+
+    assert statement_timeout_for(make_request(list_operations)) == 1500
+    assert statement_timeout_for(make_request(withdraw)) == 5000
+
+
+def test_default_statement_timeout_is_set_per_connection(monkeypatch):
+    """Testa que o timeout padrão vai nos parâmetros da conexão e o SET LOCAL só quando difere"""
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUT_MS", 5000)
+    assert asyncpg_connect_args()["server_settings"] == {"statement_timeout": "5000"}
+
+    executed = []
+    connection = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), exec_driver_sql=executed.append)
+    for info in ({"statement_timeout_ms": 5000}, {"statement_timeout_ms": 2000}, {}):
+        _apply_statement_timeout(SimpleNamespace(info=info), None, connection)
+
+    assert executed == ["SET LOCAL statement_timeout = 2000", "SET LOCAL statement_timeout = 0"]
+
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUT_MS", 0)
+    assert "server_settings" not in asyncpg_connect_args()
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_returns_503():
+    """Testa a resposta e a contagem de consultas canceladas por timeout"""
+    before = db_stats["statement_timeouts"]
+    exc = DBAPIError("SELECT 1", {}, QueryCanceledError())
+
+    response = await database_error_handler(make_request(None), exc)
+
+    assert response.status_code == 503
+    assert db_stats["statement_timeouts"] == before + 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_on_client_disconnect():
+    """Testa o cancelamento da requisição quando o cliente desconecta"""
+    before = db_stats["cancelled_on_disconnect"]
+    cancelled = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        await receive()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise AssertionError("A resposta não deveria ser enviada")
+
+    middleware = CancelOnDisconnectMiddleware(slow_app)
+    scope = {"type": "http", "method": "GET", "path": "/operations/"}
+    await asyncio.wait_for(middleware(scope, receive, send), timeout=1)
+
+    assert cancelled.is_set()
+    assert db_stats["cancelled_on_disconnect"] == before + 1
+
+
+@pytest.fixture
+async def file_engine(tmp_path, monkeypatch):
+    """get_db com um SQLite em arquivo, cujo pool (com conexões próprias) conta as conexões em uso"""
+    file_engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with file_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(db, "SessionLocal", async_sessionmaker(bind=file_engine, class_=AsyncSession, expire_on_commit=False))
+    yield file_engine
+    await file_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_releases_request_connection(file_engine):
+    """Testa que a desconexão do cliente cancela a consulta de uma rota com get_db e devolve a conexão ao pool"""
+    before = db_stats["cancelled_on_disconnect"]
+    connection_in_use = asyncio.Event()
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_in_use.set()
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # O cliente desconecta com a consulta da rota em andamento
+        await connection_in_use.wait()
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    token = create_access_token("tester")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/operations/",
+        "raw_path": b"/operations/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("test", 123),
+        "server": ("test", 80),
+    }
+
+    event.listen(file_engine.sync_engine, "checkout", on_checkout)
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+    assert connection_in_use.is_set()
+    assert file_engine.pool.checkedout() == 0
+    assert not any(message["type"] == "http.response.start" for message in sent)
+    assert db_stats["cancelled_on_disconnect"] == before + 1